@@ -18,8 +18,10 @@ import sys
 import json
 import argparse
 import asyncio
-import hashlib
+import math
+import multiprocessing
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 import websockets
@@ -27,21 +29,73 @@ import ssl
 
 # For NIP-44 decryption
 try:
-    from coincurve import PrivateKey, PublicKey
+    from coincurve import PrivateKey
+    from cryptography.hazmat.primitives import hashes
     from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
     HAS_CRYPTO = True
 except ImportError:
     HAS_CRYPTO = False
 
+# PyNaCl is optional; libsodium's ChaCha20-Poly1305 has less per-call overhead
+try:
+    from nacl.bindings import crypto_aead_chacha20poly1305_ietf_decrypt
+    HAS_NACL = True
+except ImportError:
+    HAS_NACL = False
+
 try:
     import anthropic
     HAS_ANTHROPIC = True
 except ImportError:
     HAS_ANTHROPIC = False
 
+# orjson is optional; it parses and serializes several times faster than json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# uvloop is optional; a faster event loop for the relay fan-out (not on Windows)
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+
+def json_loads(data: str | bytes):
+    """Parse JSON, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_pretty(obj) -> str:
+    """Serialize to indented JSON, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+def json_dumps_compact(obj) -> str:
+    """Serialize to JSON without whitespace, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
 # Bech32 decoding for nsec/npub
 BECH32_ALPHABET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
 
+# Maps each bech32 byte to its base-32 digit ("0"-"9", "a"-"v") so the whole
+# data part can be parsed by int(); anything outside the alphabet becomes 0xFF.
+_BECH32_TO_BASE32 = bytearray(b"\xff" * 256)
+for _i, _c in enumerate(BECH32_ALPHABET):
+    _BECH32_TO_BASE32[ord(_c)] = ord("0123456789abcdefghijklmnopqrstuv"[_i])
+_BECH32_TO_BASE32 = bytes(_BECH32_TO_BASE32)
+
 def bech32_decode(bech: str) -> tuple[str, bytes]:
     """Decode a bech32 string."""
     if bech != bech.lower() and bech != bech.upper():
@@ -51,20 +105,17 @@ def bech32_decode(bech: str) -> tuple[str, bytes]:
     if pos < 1 or pos + 7 > len(bech):
         raise ValueError("Invalid separator position")
     hrp = bech[:pos]
-    data = [BECH32_ALPHABET.find(c) for c in bech[pos+1:]]
-    if -1 in data:
+    raw = bech[pos+1:].encode().translate(_BECH32_TO_BASE32)
+    if b"\xff" in raw:
         raise ValueError("Invalid character")
-    # Convert 5-bit to 8-bit
-    acc = 0
-    bits = 0
-    result = []
-    for value in data[:-6]:  # Exclude checksum
-        acc = (acc << 5) | value
-        bits += 5
-        while bits >= 8:
-            bits -= 8
-            result.append((acc >> bits) & 0xff)
-    return hrp, bytes(result)
+    # Convert 5-bit to 8-bit: read the groups as one big integer, then drop
+    # the leftover padding bits (excluding checksum)
+    digits = raw[:-6]
+    if not digits:
+        return hrp, b""
+    nbits = len(digits) * 5
+    acc = int(digits, 32) >> (nbits % 8)
+    return hrp, acc.to_bytes(nbits // 8, 'big')
 
 def nsec_to_hex(nsec: str) -> str:
     """Convert nsec to hex private key."""
@@ -97,8 +148,53 @@ DEFAULT_RELAYS = [
     "wss://relay.nostr.net",      # General-purpose
 ]
 
+# Per-relay timeouts: connecting, draining events until EOSE, closing
+RELAY_OPEN_TIMEOUT = 10
+RELAY_DRAIN_TIMEOUT = 10
+RELAY_CLOSE_TIMEOUT = 5
+
+# Stop draining a relay that goes this long without sending anything
+RELAY_IDLE_TIMEOUT = 2
+
+# Stop waiting on slow relays once this share of them has answered and no
+# new events have shown up for RELAY_SETTLE_SECONDS. Relays that fail don't
+# count as answers. The overall deadline sits above one relay's worst case
+# so a slow but working relay is never cut off by it alone.
+RELAY_QUORUM = 0.6
+RELAY_SETTLE_SECONDS = 2.0
+RELAY_FETCH_DEADLINE = RELAY_OPEN_TIMEOUT + RELAY_DRAIN_TIMEOUT + RELAY_CLOSE_TIMEOUT + 5
+
+# Largest relay message accepted; websockets closes the connection on bigger ones
+RELAY_MAX_MESSAGE_BYTES = 1 << 20
+
+# Shared by all relay connections; building a context loads the system cert
+# store, so do it once per process
+RELAY_SSL_CONTEXT = ssl.create_default_context()
+RELAY_SSL_CONTEXT.check_hostname = False
+RELAY_SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
 # Support npub (receives feedback)
 SUPPORT_NPUB = "npub1xg8nc32sw6u3m337wzhk8gs3nqmh73r86z6a93s3hetca4jvktls68qyue"
+SUPPORT_PUBKEY_HEX = npub_to_hex(SUPPORT_NPUB)
+
+# Relay filter for gift wraps to the support pubkey; fetches add "since"
+SUPPORT_GIFT_WRAP_FILTER = {
+    "kinds": [1059],  # Gift Wrap
+    "#p": [SUPPORT_PUBKEY_HEX],  # Tagged to support pubkey
+}
+
+# Longer feedback messages are cut off before being sent to Claude
+MAX_DIGEST_MESSAGE_CHARS = 4000
+
+# Below this many events, process pool startup costs more than it saves
+PARALLEL_DECRYPT_MIN_EVENTS = 16
+
+
+def print_lines(lines: list[str]) -> None:
+    """Print progress lines with a single write instead of one per line."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
 
 def get_relays() -> list[str]:
@@ -109,130 +205,233 @@ def get_relays() -> list[str]:
     return DEFAULT_RELAYS
 
 
-async def fetch_events_from_relay(relay_url: str, filter_obj: dict, timeout: int = 10) -> list[dict]:
-    """Fetch events from a single relay."""
+async def drain_until_eose(ws, subscription_id: str, events: list[dict], timeout: float) -> None:
+    """
+    Append EVENTs for a subscription to events until the relay sends EOSE.
+    
+    Raises TimeoutError after timeout seconds in total, or after
+    RELAY_IDLE_TIMEOUT seconds without a message. One timer covers both
+    limits and is pushed back per message, rather than a wait_for per recv.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    async with asyncio.timeout_at(min(deadline, loop.time() + RELAY_IDLE_TIMEOUT)) as idle:
+        while True:
+            data = json_loads(await ws.recv())
+            idle.reschedule(min(deadline, loop.time() + RELAY_IDLE_TIMEOUT))
+            
+            if data[0] == "EVENT" and data[1] == subscription_id:
+                events.append(data[2])
+            elif data[0] == "EOSE":
+                return
+
+
+async def fetch_events_from_relay(relay_url: str, filter_obj: dict,
+                                  timeout: int = RELAY_DRAIN_TIMEOUT) -> Optional[list[dict]]:
+    """
+    Fetch events from a single relay.
+    
+    Returns None if the relay failed before sending any events, so callers
+    can tell a failure apart from a relay that had nothing.
+    """
     events = []
     subscription_id = f"feedback_{int(time.time())}"
     
     try:
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        async with websockets.connect(relay_url, ssl=ssl_context, close_timeout=5) as ws:
+        # Gift wraps are ciphertext, so permessage-deflate would only burn CPU.
+        # Connections are short-lived, so keepalive pings aren't needed either.
+        async with websockets.connect(
+            relay_url,
+            ssl=RELAY_SSL_CONTEXT,
+            open_timeout=RELAY_OPEN_TIMEOUT,
+            close_timeout=RELAY_CLOSE_TIMEOUT,
+            compression=None,
+            max_size=RELAY_MAX_MESSAGE_BYTES,
+            ping_interval=None,
+        ) as ws:
             # Send REQ
             req = json.dumps(["REQ", subscription_id, filter_obj])
             await ws.send(req)
             
-            # Receive events until EOSE or timeout
-            start = time.time()
-            while time.time() - start < timeout:
-                try:
-                    msg = await asyncio.wait_for(ws.recv(), timeout=2)
-                    data = json.loads(msg)
-                    
-                    if data[0] == "EVENT" and data[1] == subscription_id:
-                        events.append(data[2])
-                    elif data[0] == "EOSE":
-                        break
-                except asyncio.TimeoutError:
-                    break
+            # Receive events until EOSE, timeout or the relay goes idle
+            try:
+                await drain_until_eose(ws, subscription_id, events, timeout)
+            except TimeoutError:
+                pass
             
             # Send CLOSE
             await ws.send(json.dumps(["CLOSE", subscription_id]))
             
     except Exception as e:
         print(f"  ⚠️  {relay_url}: {e}")
+        if not events:
+            return None
     
     return events
 
 
-async def fetch_gift_wraps(support_pubkey_hex: str, since_timestamp: int) -> list[dict]:
-    """Fetch Gift Wrap events from multiple relays."""
-    filter_obj = {
-        "kinds": [1059],  # Gift Wrap
-        "#p": [support_pubkey_hex],  # Tagged to support pubkey
-        "since": since_timestamp
-    }
+async def fetch_gift_wraps(since_timestamp: int) -> list[dict]:
+    """Fetch Gift Wrap events to the support pubkey from multiple relays."""
+    filter_obj = {**SUPPORT_GIFT_WRAP_FILTER, "since": since_timestamp}
     
     relays = get_relays()
-    all_events = []
-    seen_ids = set()
+    events_by_id = {}
     
     print(f"\n📡 Fetching from {len(relays)} relays...")
     
-    tasks = [fetch_events_from_relay(relay, filter_obj) for relay in relays]
-    results = await asyncio.gather(*tasks)
-    
-    for relay, events in zip(relays, results):
-        for event in events:
-            event_id = event.get("id", "")
-            if event_id not in seen_ids:
-                seen_ids.add(event_id)
-                all_events.append(event)
-        if events:
-            print(f"  ✓ {relay}: {len(events)} events")
+    tasks = {
+        asyncio.create_task(fetch_events_from_relay(relay, filter_obj)): relay
+        for relay in relays
+    }
+    pending = set(tasks)
+    results = {}
+    quorum = math.ceil(len(relays) * RELAY_QUORUM)
+    
+    answered = 0
+    
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + RELAY_FETCH_DEADLINE
+    settle_from = None  # set once quorum is reached
+    
+    # Handle relays as they finish so the slowest one doesn't bound the fetch
+    while pending:
+        now = loop.time()
+        wait_timeout = deadline - now
+        if settle_from is not None:
+            wait_timeout = min(wait_timeout, settle_from + RELAY_SETTLE_SECONDS - now)
+        if wait_timeout <= 0:
+            break
+        
+        done, pending = await asyncio.wait(
+            pending, timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done:
+            events = task.result()
+            results[tasks[task]] = events
+            if events is None:
+                continue
+            answered += 1
+            # Event ids are content hashes, so duplicates can simply overwrite
+            seen_before = len(events_by_id)
+            events_by_id.update({event["id"]: event for event in events if "id" in event})
+            # The settle window restarts on new events, but never opens
+            # before quorum is reached
+            if settle_from is None:
+                if answered >= quorum:
+                    settle_from = loop.time()
+            elif len(events_by_id) > seen_before:
+                settle_from = loop.time()
+    
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    
+    status_lines = []
+    for relay in relays:
+        if relay not in results:
+            status_lines.append(f"  - {relay}: skipped (slow)")
+            continue
+        events = results[relay]
+        if events is None:
+            status_lines.append(f"  ✗ {relay}: failed")
+        elif events:
+            status_lines.append(f"  ✓ {relay}: {len(events)} events")
         else:
-            print(f"  - {relay}: 0 events")
+            status_lines.append(f"  - {relay}: 0 events")
+    print_lines(status_lines)
     
-    return all_events
-
-
-def hkdf_extract_expand(salt: bytes, ikm: bytes, info: bytes, length: int) -> bytes:
-    """Simple HKDF implementation."""
-    import hmac
-    # Extract
-    prk = hmac.new(salt if salt else b'\x00' * 32, ikm, hashlib.sha256).digest()
-    # Expand
-    t = b""
-    okm = b""
-    for i in range(1, (length + 31) // 32 + 1):
-        t = hmac.new(prk, t + info + bytes([i]), hashlib.sha256).digest()
-        okm += t
-    return okm[:length]
+    return list(events_by_id.values())
 
 
 def nip44_decrypt(ciphertext_b64: str, conversation_key: bytes) -> str:
     """Decrypt NIP-44 encrypted content."""
     import base64
     
-    ciphertext = base64.b64decode(ciphertext_b64)
+    # Slice through a memoryview so the payload isn't copied
+    ciphertext = memoryview(base64.b64decode(ciphertext_b64))
     
     # NIP-44 format: version (1) + nonce (32) + ciphertext + tag (16)
     version = ciphertext[0]
     if version != 2:
         raise ValueError(f"Unsupported NIP-44 version: {version}")
     
-    nonce = ciphertext[1:33]
+    nonce = ciphertext[1:33].tobytes()
     encrypted = ciphertext[33:]
     
     # Derive encryption key using HKDF
-    enc_key = hkdf_extract_expand(nonce, conversation_key, b"nip44-v2", 76)
+    enc_key = HKDF(
+        algorithm=hashes.SHA256(), length=76, salt=nonce, info=b"nip44-v2"
+    ).derive(conversation_key)
     chacha_key = enc_key[:32]
     chacha_nonce = enc_key[32:44]
     
     # Decrypt with ChaCha20-Poly1305
-    cipher = ChaCha20Poly1305(chacha_key)
-    plaintext_padded = cipher.decrypt(chacha_nonce, encrypted, None)
+    if HAS_NACL:
+        # PyNaCl only accepts real bytes
+        plaintext_padded = crypto_aead_chacha20poly1305_ietf_decrypt(
+            encrypted.tobytes(), None, chacha_nonce, chacha_key
+        )
+    else:
+        cipher = ChaCha20Poly1305(chacha_key)
+        plaintext_padded = cipher.decrypt(chacha_nonce, encrypted, None)
     
     # Remove padding (first 2 bytes are length)
+    plaintext_padded = memoryview(plaintext_padded)
     length = int.from_bytes(plaintext_padded[:2], 'big')
     plaintext = plaintext_padded[2:2+length]
     
-    return plaintext.decode('utf-8')
+    return str(plaintext, 'utf-8')
+
+
+class ConversationKeyDeriver:
+    """
+    Computes NIP-44 conversation keys (ECDH shared secrets) for one recipient.
+    
+    The recipient's PrivateKey is parsed once and reused for every event.
+    Seal sender keys are cached: gift wrap keys are ephemeral, but the same
+    user often sends several messages.
+    """
+    
+    def __init__(self, sk_hex: str):
+        self._sk = PrivateKey(bytes.fromhex(sk_hex))
+        self._sender_keys: dict[str, bytes] = {}
+    
+    def derive(self, pk_hex: str) -> bytes:
+        """Compute the conversation key with an x-only pubkey."""
+        # coincurve expects compressed pubkey format (33 bytes with 02/03 prefix)
+        return self._sk.ecdh(bytes.fromhex("02" + pk_hex))
+    
+    def derive_sender(self, pk_hex: str) -> bytes:
+        """Like derive, but cached per pubkey for repeat seal senders."""
+        key = self._sender_keys.get(pk_hex)
+        if key is None:
+            key = self._sender_keys[pk_hex] = self.derive(pk_hex)
+        return key
+    
+    def clear(self) -> None:
+        """Drop cached shared secrets."""
+        self._sender_keys.clear()
+
+
+# Each pool worker builds its own deriver once in init_decrypt_worker, so the
+# key is parsed once and the sender cache is shared across all events it
+# handles. The cached secrets live only as long as the worker process, which
+# exits when the pool shuts down.
+_worker_keys: Optional[ConversationKeyDeriver] = None
+
 
+def init_decrypt_worker(sk_hex: str) -> None:
+    """ProcessPoolExecutor initializer: set up this worker's key deriver."""
+    global _worker_keys
+    _worker_keys = ConversationKeyDeriver(sk_hex)
 
-def get_conversation_key(sk_hex: str, pk_hex: str) -> bytes:
-    """Compute NIP-44 conversation key (shared secret)."""
-    sk = PrivateKey(bytes.fromhex(sk_hex))
-    # coincurve expects compressed pubkey format (33 bytes with 02/03 prefix)
-    pk = PublicKey(bytes.fromhex("02" + pk_hex))
-    # ECDH shared secret
-    shared = sk.ecdh(pk.format())
-    return shared
 
+def decrypt_gift_wrap_in_worker(event: dict) -> Optional[dict]:
+    """decrypt_gift_wrap using the deriver set up by init_decrypt_worker."""
+    return decrypt_gift_wrap(event, _worker_keys)
 
-def decrypt_gift_wrap(event: dict, recipient_sk_hex: str) -> Optional[dict]:
+
+def decrypt_gift_wrap(event: dict, keys: ConversationKeyDeriver) -> Optional[dict]:
     """
     Decrypt a NIP-59 Gift Wrap event.
     
@@ -241,31 +440,41 @@ def decrypt_gift_wrap(event: dict, recipient_sk_hex: str) -> Optional[dict]:
     2. Seal (kind 13) - contains sender info, encrypted
     3. Rumor - the actual content
     """
+    # Normalize up front so dumps needs no default=; a malformed timestamp
+    # shouldn't cost us an otherwise readable message. Out-of-range values
+    # (negative, or too big for orjson's 64-bit ints) become 0 as well.
+    try:
+        received_at = int(event.get("created_at") or 0)
+    except (TypeError, ValueError, OverflowError):
+        received_at = 0
+    if not 0 <= received_at < 2**63:
+        received_at = 0
+    
     try:
         # Step 1: Decrypt gift wrap to get seal
         ephemeral_pk = event["pubkey"]
-        conversation_key = get_conversation_key(recipient_sk_hex, ephemeral_pk)
+        conversation_key = keys.derive(ephemeral_pk)
         seal_json = nip44_decrypt(event["content"], conversation_key)
-        seal = json.loads(seal_json)
+        seal = json_loads(seal_json)
         
         # Step 2: Decrypt seal to get rumor
         sender_pk = seal["pubkey"]
-        conversation_key_2 = get_conversation_key(recipient_sk_hex, sender_pk)
+        conversation_key_2 = keys.derive_sender(sender_pk)
         rumor_json = nip44_decrypt(seal["content"], conversation_key_2)
-        rumor = json.loads(rumor_json)
+        rumor = json_loads(rumor_json)
         
         # Step 3: Parse the rumor content (our feedback JSON)
         try:
-            feedback = json.loads(rumor.get("content", "{}"))
+            feedback = json_loads(rumor.get("content", "{}"))
             feedback["_sender_pubkey"] = sender_pk
-            feedback["_received_at"] = event.get("created_at", 0)
+            feedback["_received_at"] = received_at
             return feedback
         except json.JSONDecodeError:
             return {
                 "type": "unknown",
                 "message": rumor.get("content", ""),
                 "_sender_pubkey": sender_pk,
-                "_received_at": event.get("created_at", 0)
+                "_received_at": received_at
             }
             
     except Exception as e:
@@ -273,16 +482,38 @@ def decrypt_gift_wrap(event: dict, recipient_sk_hex: str) -> Optional[dict]:
         return None
 
 
-def fetch_feedback(sk_hex: str, days: int = 7) -> list[dict]:
-    """Fetch and decrypt all feedback from the last N days."""
-    support_pubkey_hex = npub_to_hex(SUPPORT_NPUB)
-    since_timestamp = int((datetime.now() - timedelta(days=days)).timestamp())
+def decrypt_events(events: list[dict], sk_hex: str) -> list[Optional[dict]]:
+    """Decrypt gift wraps, using a process pool for large batches."""
+    if len(events) > PARALLEL_DECRYPT_MIN_EVENTS:
+        # ECDH dominates per-event cost, so spread it across cores. Spawn
+        # rather than fork: the event loop's resolver threads may be running,
+        # and forking a multi-threaded process can deadlock. Leaving the with
+        # block shuts the workers down, taking their cached secrets with them.
+        with ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_decrypt_worker,
+            initargs=(sk_hex,),
+        ) as executor:
+            results = list(executor.map(decrypt_gift_wrap_in_worker, events, chunksize=8))
+    else:
+        keys = ConversationKeyDeriver(sk_hex)
+        results = [decrypt_gift_wrap(event, keys) for event in events]
+        # Don't keep shared secrets around longer than needed
+        keys.clear()
+    return results
+
+
+async def fetch_feedback(sk_hex: str, days: int = 7, now: Optional[datetime] = None) -> list[dict]:
+    """Fetch and decrypt all feedback from the N days before now."""
+    since = (now or datetime.now()) - timedelta(days=days)
+    since_timestamp = int(since.timestamp())
     
-    print(f"🔑 Support pubkey: {support_pubkey_hex[:16]}...")
-    print(f"📅 Looking back {days} days (since {datetime.fromtimestamp(since_timestamp)})")
+    print(f"🔑 Support pubkey: {SUPPORT_PUBKEY_HEX[:16]}...")
+    print(f"📅 Looking back {days} days (since {since.replace(microsecond=0)})")
     
     # Fetch events
-    events = asyncio.run(fetch_gift_wraps(support_pubkey_hex, since_timestamp))
+    events = await fetch_gift_wraps(since_timestamp)
     print(f"\n🔍 Found {len(events)} Gift Wrap events")
     
     if not events:
@@ -291,13 +522,16 @@ def fetch_feedback(sk_hex: str, days: int = 7) -> list[dict]:
     # Decrypt each event
     feedback_items = []
     print("\n🔓 Decrypting messages...")
+    # Decryption is CPU-bound, so keep it off the event loop
+    results = await asyncio.to_thread(decrypt_events, events, sk_hex)
     
-    for event in events:
-        feedback = decrypt_gift_wrap(event, sk_hex)
+    preview_lines = []
+    for feedback in results:
         if feedback:
             feedback_items.append(feedback)
             msg_preview = feedback.get('message', '')[:40]
-            print(f"  ✓ {feedback.get('type', 'unknown')}: {msg_preview}...")
+            preview_lines.append(f"  ✓ {feedback.get('type', 'unknown')}: {msg_preview}...")
+    print_lines(preview_lines)
     
     print(f"\n✅ Decrypted {len(feedback_items)}/{len(events)} messages")
     return feedback_items
@@ -309,16 +543,23 @@ def generate_digest(feedback_items: list[dict]) -> str:
         return "📭 No feedback received in this period.\n\nThis could mean:\n- No users have submitted feedback yet\n- Feedback events haven't propagated to the queried relays\n- The time window didn't capture any submissions"
     
     if not HAS_ANTHROPIC:
-        return "⚠️ Anthropic SDK not installed. Cannot generate AI summary.\n\nRaw feedback:\n" + json.dumps(feedback_items, indent=2, default=str)
+        return "⚠️ Anthropic SDK not installed. Cannot generate AI summary.\n\nRaw feedback:\n" + json_dumps_pretty(feedback_items)
     
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
-        return "⚠️ ANTHROPIC_API_KEY not set.\n\nRaw feedback:\n" + json.dumps(feedback_items, indent=2, default=str)
+        return "⚠️ ANTHROPIC_API_KEY not set.\n\nRaw feedback:\n" + json_dumps_pretty(feedback_items)
     
     print("\n🤖 Generating AI digest with Claude...")
     
     client = anthropic.Anthropic(api_key=api_key)
-    feedback_text = json.dumps(feedback_items, indent=2, default=str)
+    # Compact JSON and capped message length keep the prompt's token count down
+    prompt_items = []
+    for item in feedback_items:
+        message = item.get("message")
+        if isinstance(message, str) and len(message) > MAX_DIGEST_MESSAGE_CHARS:
+            item = {**item, "message": message[:MAX_DIGEST_MESSAGE_CHARS] + "… [truncated]"}
+        prompt_items.append(item)
+    feedback_text = json_dumps_compact(prompt_items)
     
     prompt = f"""Analyze these {len(feedback_items)} feedback submissions for the On-Chain Disc Golf app (a disc golf scorecard with Bitcoin/Lightning payments).
 
@@ -341,21 +582,21 @@ Feedback:
 {feedback_text}
 ```"""
 
-    response = client.messages.create(
+    with client.messages.stream(
         model="claude-sonnet-4-20250514",
         max_tokens=2000,
         messages=[{"role": "user", "content": prompt}]
-    )
-    
-    return response.content[0].text
+    ) as stream:
+        return "".join(stream.text_stream)
 
 
-def format_output(digest: str, feedback_items: list[dict], days: int) -> str:
+def format_output(digest: str, feedback_items: list[dict], days: int,
+                  generated_at: Optional[str] = None) -> str:
     """Format the final output."""
     header = f"""# 📬 On-Chain Disc Golf - Feedback Digest
 
 **Period:** Last {days} days  
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}  
+**Generated:** {generated_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}  
 **Total Feedback:** {len(feedback_items)} items
 
 ---
@@ -364,6 +605,32 @@ def format_output(digest: str, feedback_items: list[dict], days: int) -> str:
     return header + digest
 
 
+async def run_digest(args: argparse.Namespace, sk_hex: str) -> None:
+    """Fetch, summarize and output feedback for the parsed CLI args."""
+    # One timestamp for the lookback window, header and filename
+    now = datetime.now()
+    
+    # Fetch feedback
+    feedback_items = await fetch_feedback(sk_hex, days=args.days, now=now)
+    
+    if args.raw:
+        output = json_dumps_pretty(feedback_items)
+    else:
+        # The Anthropic client is synchronous; don't block the loop on it
+        digest = await asyncio.to_thread(generate_digest, feedback_items)
+        output = format_output(digest, feedback_items, args.days,
+                               generated_at=now.strftime('%Y-%m-%d %H:%M:%S UTC'))
+    
+    # Handle output
+    if args.output == "terminal":
+        print("\n" + output)
+    elif args.output == "file":
+        filename = f"feedback_digest_{now.strftime('%Y%m%d_%H%M%S')}.md"
+        with open(filename, "w") as f:
+            f.write(output)
+        print(f"\n📄 Saved to {filename}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate feedback digest for On-Chain Disc Golf")
     parser.add_argument("--days", type=int, default=7, help="Days to look back (default: 7)")
@@ -388,28 +655,18 @@ def main():
     
     try:
         sk_hex = nsec_to_hex(nsec)
+        # Reject out-of-range keys here rather than mid-decrypt
+        PrivateKey(bytes.fromhex(sk_hex))
         print(f"🔑 Loaded keypair successfully")
     except Exception as e:
         print(f"\n❌ Invalid nsec: {e}")
         sys.exit(1)
     
-    # Fetch feedback
-    feedback_items = fetch_feedback(sk_hex, days=args.days)
-    
-    if args.raw:
-        output = json.dumps(feedback_items, indent=2, default=str)
+    # Run the whole flow in a single event loop
+    if HAS_UVLOOP:
+        uvloop.run(run_digest(args, sk_hex))
     else:
-        digest = generate_digest(feedback_items)
-        output = format_output(digest, feedback_items, args.days)
-    
-    # Handle output
-    if args.output == "terminal":
-        print("\n" + output)
-    elif args.output == "file":
-        filename = f"feedback_digest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-        with open(filename, "w") as f:
-            f.write(output)
-        print(f"\n📄 Saved to {filename}")
+        asyncio.run(run_digest(args, sk_hex))
     
     print("\n✅ Done!")
 